@@ -8,9 +8,12 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
 import argparse
+import concurrent.futures
+import functools
 import hashlib
 import os
 import platform
+import shlex
 import subprocess
 import tempfile
 import time
@@ -19,7 +22,13 @@ from pathlib import Path
 from typing import List, Tuple
 
 import termcolor
-import yaml
+
+from isaac_ros_common_config_utils import (
+    CACHE_DIR,
+    load_cached,
+    read_cache_file,
+    read_yaml,
+    write_cache_file)
 
 
 # -----------------------------------------------------------------------------
@@ -29,40 +38,48 @@ def extract_env_vars(source_filepath, keys=None):
     if not os.path.exists(source_filepath):
         return None
 
+    # Source the file once and print each requested key's array expansion
+    # (NUL-terminated, in order) followed by the environment. Bash arrays are
+    # never exported, so they only show up through the expansions.
+    array_keys = list(keys) if keys is not None else []
+    script = (
+        'set -a && source "$0" && set +a && '
+        'for key in "$@"; do unset -n _value; declare -n _value="$key"; '
+        'printf "%s\\0" "${_value[*]}"; done && env -0'
+    )
     try:
         _, output, _ = run_shell(
-            f"bash -c 'set -a && source {source_filepath} && env'",
+            ['bash', '-c', script, source_filepath, *array_keys],
             capture_output=True,
             check=True
         )
     except subprocess.CalledProcessError:
         return None
 
+    records = output.split("\0")
+    array_values = records[:len(array_keys)]
+
     env_values_by_key = {}
-    for line in output.splitlines():
-        key, _, value = line.partition("=")
-        if keys is None or key in keys:
+    for record in records[len(array_keys):]:
+        key, _, value = record.partition("=")
+        if key and (keys is None or key in array_keys):
             env_values_by_key[key] = value
 
-    # Check for bash arrays for any remaining keys
-    for key in keys:
+    # Remaining keys are bash arrays (or unset)
+    for key, value in zip(array_keys, array_values):
         if key not in env_values_by_key:
-            _, output, _ = run_shell(
-                f"bash -c 'source {source_filepath} && echo ${{{key}[@]}}'",
-                capture_output=True
-            )
-            env_values_by_key[key] = output.strip().rstrip().split(" ")
+            env_values_by_key[key] = value.strip().split(" ")
     return env_values_by_key
 
 
-def run_shell(command: str,
+def run_shell(command: List[str],
               capture_output=True,
               verbose=False,
               check=False,
               env=None) -> Tuple[bool, str, str]:
-    """Run a shell command in a subprocess and return the result."""
+    """Run a command (as an argv list, without a shell) and return the result."""
     if verbose:
-        termcolor.cprint(command, "yellow", attrs=["bold"], flush=True)
+        termcolor.cprint(shlex.join(command), "yellow", attrs=["bold"], flush=True)
 
     os_env = os.environ.copy()
     if env:
@@ -72,7 +89,6 @@ def run_shell(command: str,
         capture_output=capture_output,
         text=True,
         check=check,
-        shell=True,
         env=os_env
     )
     return (completed_process.returncode == 0,
@@ -117,11 +133,14 @@ def check_docker_logins(base_docker_registry_names, fail_on_anon):
 
 
 def calculate_md5(filename):
-    hash_md5 = hashlib.md5()
-    with open(filename, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+    with open(filename, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+
+            return hashlib.file_digest(f, "md5").hexdigest()
+        hash_md5 = hashlib.md5()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
             hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+        return hash_md5.hexdigest()
 
 
 # -----------------------------------------------------------------------------
@@ -136,20 +155,14 @@ class ImageKey:
 
     @classmethod
     def from_key_set(cls, image_key_set, key_order=None):
-        import functools
+        # Keys in key_order come first (by position), then the rest alphabetically
         key_order = key_order or []
-
-        def compare_image_keys(a, b):
-            if a in key_order and b in key_order:
-                return -1 if key_order.index(a) < key_order.index(b) else 1
-            elif a in key_order:
-                return -1
-            elif b in key_order:
-                return 1
-            else:
-                return -1 if a < b else 1
-
-        return cls(sorted(image_key_set, key=functools.cmp_to_key(compare_image_keys)))
+        order = {}
+        for index, key in enumerate(key_order):
+            order.setdefault(key, index)
+        # Positions index into key_order, which may contain duplicates
+        unordered = len(key_order)
+        return cls(sorted(image_key_set, key=lambda key: (order.get(key, unordered), key)))
 
     @classmethod
     def from_string(cls, image_key_str):
@@ -206,7 +219,17 @@ class Config:
             'CONFIG_DOCKER_SEARCH_DIRS': 'docker_search_dirs',
             'BASE_DOCKER_REGISTRY_NAMES': 'cache_from_registry_names'
         }
-        config_vars = extract_env_vars(common_config_file, config_remap.keys())
+        # Sourcing the file can depend on any inherited variable (PWD, HOME, ...),
+        # which differs between runs, so its result is only reused in-process.
+        config_vars = load_cached(
+            common_config_file,
+            lambda path: extract_env_vars(path, config_remap.keys()),
+            cache_key_parts=(
+                tuple(config_remap.keys()),
+                hashlib.sha1(repr(sorted(os.environ.items())).encode()).hexdigest()
+            ),
+            persist=False
+        )
         if not config_vars:
             return False
         config_dict = {}
@@ -217,8 +240,7 @@ class Config:
     def load_yaml(self, config_file):
         if not os.path.exists(config_file):
             return False
-        with open(config_file, 'r') as f:
-            config_dict = yaml.safe_load(f)
+        config_dict = read_yaml(config_file)
         return self.load(config_dict)
 
     def load(self, config_dict) -> None:
@@ -231,7 +253,9 @@ class Config:
             if processor:
                 prepend_list = [processor(val) for val in prepend_list]
             base_list = getattr(self, variable_name, [])
-            new_base_list = [x for x in base_list if x not in prepend_list]
+            # docker_search_dirs grows with every config source that is loaded
+            prepend_set = set(prepend_list)
+            new_base_list = [x for x in base_list if x not in prepend_set]
             setattr(self, variable_name, prepend_list + new_base_list)
 
         def override_value(key, variable_name=None, processor=None):
@@ -246,7 +270,8 @@ class Config:
 
         override_value(
             'image_key_order',
-            processor=lambda x: [str(key).split('.') for key in x][0]
+            # Only the first entry defines the key order
+            processor=lambda x: str(x[0]).split('.')
         )
         if self.common_config_file_:
             list_prepend_unique(
@@ -302,24 +327,41 @@ class ImageBuildPlan:
         self.dockerfiles_ = dockerfiles
         self.image_key_ = image_key
         self.build_variables_ = {}
+        self.md5hash_ = None
+        self.target_names_ = None
+
+    def precompute_dockerfile_hashes(self):
+        """Hash any not-yet-hashed Dockerfiles of this plan concurrently."""
+        pending = [d for d in self.dockerfiles_ if not d.md5_hash_]
+        if len(pending) < 2:
+            return
+        # hashlib releases the GIL while hashing, so threads overlap reads and hashing
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            digests = executor.map(calculate_md5, [d.dockerfile_path_ for d in pending])
+            for d, digest in zip(pending, digests):
+                d.md5_hash_ = digest
 
     def md5hash(self) -> str:
-        tmp_file = "/tmp/dockerhash.tmp"
-        subprocess.getoutput(f'rm -Rf {tmp_file}')
-        subprocess.getoutput(f'touch {tmp_file}')
-        for d in sorted(self.dockerfiles_, key=lambda x: x.image_key()):
-            os.chdir(d.context_dir_)
-            subprocess.getoutput(
-                f"md5sum {d.dockerfile_path_.name} >> {tmp_file}"
-            )
-        hash_value = subprocess.getoutput(f"md5sum {tmp_file}").partition(' ')[0]
-        return hash_value
+        if not self.md5hash_:
+            self.precompute_dockerfile_hashes()
+            # Hash of the concatenated `md5sum <dockerfile>` lines, computed in-process.
+            # The line format must stay identical to md5sum output so that image
+            # tags remain stable across versions.
+            hash_md5 = hashlib.md5()
+            for d in sorted(self.dockerfiles_, key=lambda x: x.image_key()):
+                hash_md5.update(f"{d.md5_hash()}  {d.dockerfile_path_.name}\n".encode())
+            self.md5hash_ = hash_md5.hexdigest()
+        return self.md5hash_
 
     def target_names(self):
-        return [
-            ImageBuildPlan(self.dockerfiles_[:i+1]).target_name()
-            for i in range(len(self.dockerfiles_))
-        ]
+        # Prefix plans share Dockerfile instances, so each file is only read once.
+        if self.target_names_ is None:
+            self.precompute_dockerfile_hashes()
+            self.target_names_ = [
+                ImageBuildPlan(self.dockerfiles_[:i+1]).target_name()
+                for i in range(len(self.dockerfiles_))
+            ]
+        return self.target_names_
 
     def target_name(self):
         names = "-".join([d.image_key() for d in self.dockerfiles_])
@@ -364,55 +406,35 @@ class ImageBuildPlan:
         })
         build_plan['variables'] = variables
 
-        def get_target(dockerfiles: List[Dockerfile]):
-            return ImageBuildPlan(dockerfiles).target_name()
+        target_names = self.target_names()
+        # Use different tag format for NVCR registries vs others
+        if cache_from_registry and "nvcr.io" in cache_from_registry:
+            # For NVCR registries, use colon-separated tags (repository:tag)
+            target_tags = [f"{cache_from_registry}:{name}-{platform}" for name in target_names]
+        else:
+            # For other registries, use slash-separated paths (registry/image:tag)
+            target_tags = [
+                f"{cache_from_registry}/{name}-{platform}:latest" for name in target_names
+            ]
 
         build_plan['targets'] = {}
         targets = build_plan['targets']
         for i, target in enumerate(dockerfile_list):
-            target_name = get_target(dockerfile_list[:i+1])
+            target_name = target_names[i]
             targets[target_name] = {'name': target_name}
             target_dict = targets[target_name]
             target_dict['context'] = str(target.context_dir_)
             target_dict['dockerfile'] = target.dockerfile_path_.name
             target_dict['args'] = {'PLATFORM': file_arch}
+            target_dict['tags'] = [target_tags[i]]
             if i == 0:
                 # First target – set (if provided) BASE_IMAGE.
-                # Use different tag format for NVCR registries vs others
-                if cache_from_registry and "nvcr.io" in cache_from_registry:
-                    # For NVCR registries, use colon-separated tags (repository:tag)
-                    target_dict['tags'] = [
-                        f"{cache_from_registry}:{target_name}-{platform}"
-                    ]
-                else:
-                    # For other registries, use slash-separated paths (registry/image:tag)
-                    target_dict['tags'] = [
-                        f"{cache_from_registry}/{target_name}-{platform}:latest"
-                    ]
                 if base_image is not None:
                     target_dict['args']['BASE_IMAGE'] = base_image
             else:
-                depends_name = ImageBuildPlan(dockerfile_list[:i]).target_name()
-                # Use different tag format for NVCR registries vs others
-                if cache_from_registry and "nvcr.io" in cache_from_registry:
-                    # For NVCR registries, use colon-separated tags (repository:tag)
-                    target_dict['tags'] = [
-                        f"{cache_from_registry}:{target_name}-{platform}"
-                    ]
-                    # Also update BASE_IMAGE reference to use correct format
-                    base_image_ref = f"{cache_from_registry}:{depends_name}-{platform}"
-                else:
-                    # For other registries, use slash-separated paths (registry/image:tag)
-                    target_dict['tags'] = [
-                        f"{cache_from_registry}/{target_name}-{platform}:latest"
-                    ]
-                    # Also update BASE_IMAGE reference to use correct format
-                    base_image_ref = f"{cache_from_registry}/{depends_name}-{platform}:latest"
-
-                target_dict['args'].update({
-                    'BASE_IMAGE': base_image_ref
-                })
-                target_dict['depends_on'] = [f"{get_target(dockerfile_list[:i])}"]
+                # Later targets build on the previous target's tag
+                target_dict['args']['BASE_IMAGE'] = target_tags[i - 1]
+                target_dict['depends_on'] = [target_names[i - 1]]
             if nvcr_tag:
                 target_dict['tags'].append(f"{nvcr_url}:{target_name}")
 
@@ -425,7 +447,7 @@ class ImageBuildPlan:
 
         # Optionally add a final target that simply retags the built image.
         if target_image_name is not None:
-            final_key = get_target(dockerfile_list)
+            final_key = target_names[-1]
             final_target = targets[final_key]
             if context_dir is not None:
                 final_target['context'] = context_dir
@@ -440,45 +462,46 @@ class ImageBuildPlan:
         return build_plan
 
     @staticmethod
-    def as_hcl_str(bake_plan_dict):
-        import io
-        f = io.StringIO()
+    def write_hcl(bake_plan_dict, f):
+        """Write the docker buildx bake configuration as HCL to the file-like f."""
+        f.writelines(ImageBuildPlan.hcl_blocks(bake_plan_dict))
+
+    @staticmethod
+    def hcl_blocks(bake_plan_dict):
+        """Yield the HCL text of each variable and target block, one string per block."""
         variables = bake_plan_dict['variables']
         for key, value in variables.items():
-            f.write(f'variable "{key}" {{\n')
-            f.write(f'  default = "{value}"\n')
-            f.write('}\n\n')
+            yield f'variable "{key}" {{\n  default = "{value}"\n}}\n\n'
 
         def quoted_list(str_list: List[str]):
             return '[' + ', '.join([f'"{value}"' for value in str_list]) + ']'
 
+        def quoted_map(str_map):
+            return ',\n'.join(f'    {k} = "{v}"' for k, v in str_map.items())
+
         targets = bake_plan_dict['targets']
         for target_name, target in targets.items():
-            f.write(f'target "{target_name}" {{\n')
+            parts = [f'target "{target_name}" {{\n']
 
-            def write_target_attr(attr_key, processor=None):
+            def add_target_attr(attr_key, processor=None):
                 if attr_key in target:
                     if processor:
                         value = processor(target[attr_key])
                     else:
                         value = f'"{target[attr_key]}"'
-                    f.write(f'  {attr_key:12} = {value}\n')
+                    parts.append(f'  {attr_key:12} = {value}\n')
 
-            write_target_attr('context')
-            write_target_attr('dockerfile')
-            write_target_attr('dockerfile-inline')
-            write_target_attr('tags', lambda x: quoted_list(x))
-            write_target_attr('inherits', lambda x: quoted_list(x))
+            add_target_attr('context')
+            add_target_attr('dockerfile')
+            add_target_attr('dockerfile-inline')
+            add_target_attr('tags', quoted_list)
+            add_target_attr('inherits', quoted_list)
             if 'args' in target:
-                f.write('  args       = {\n')
-                items = list(target['args'].items())
-                for i, (k, v) in enumerate(items):
-                    comma = "," if i < len(items) - 1 else ""
-                    f.write(f'    {k} = "{v}"{comma}\n')
-                f.write('  }\n')
-            write_target_attr('depends_on', lambda x: quoted_list(x))
-            f.write('}\n\n')
-        return f.getvalue()
+                args = quoted_map(target['args'])
+                parts.append('  args       = {\n' + (f'{args}\n' if args else '') + '  }\n')
+            add_target_attr('depends_on', quoted_list)
+            parts.append('}\n\n')
+            yield "".join(parts)
 
 
 def resolve_dockerfiles(
@@ -489,34 +512,47 @@ def resolve_dockerfiles(
 ):
     dockerfiles = []
     image_ids = list(image_key.image_keys_)
+    # Anchor relative search dirs (e.g. --context_dir) so that Dockerfile and
+    # context paths do not depend on the current working directory later on.
+    docker_search_dirs = [os.path.abspath(d) for d in docker_search_dirs]
+
+    # Index the Dockerfiles by suffix with one directory listing per search dir.
+    # Earlier search dirs take precedence.
+    dockerfile_dirs_by_suffix = {}
+    for docker_search_dir in docker_search_dirs:
+        try:
+            with os.scandir(docker_search_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('Dockerfile.') and entry.is_file():
+                        dockerfile_dirs_by_suffix.setdefault(
+                            entry.name[len('Dockerfile.'):], docker_search_dir
+                        )
+        except OSError:
+            if verbose:
+                print(f"Skipping unreadable docker search dir {docker_search_dir}")
+
     while image_ids:
         unmatched_id_count = len(image_ids)
         for i in reversed(range(len(image_ids))):
-            matched = False
             if ignore_composite_keys and i == 1:
                 break
             layer_image_ids = image_ids[:i+1]
             layer_image_suffix = ".".join(layer_image_ids)
             if verbose:
                 print(f"Searching for {layer_image_suffix}")
-            for docker_search_dir in docker_search_dirs:
-                dockerfile = Path(f"{docker_search_dir}/Dockerfile.{layer_image_suffix}")
+            docker_search_dir = dockerfile_dirs_by_suffix.get(layer_image_suffix)
+            if docker_search_dir is not None:
+                dockerfile = Path(docker_search_dir) / f"Dockerfile.{layer_image_suffix}"
+                dockerfiles.append(
+                    Dockerfile(dockerfile, Path(docker_search_dir),
+                               ImageKey(layer_image_ids))
+                )
+                image_ids = image_ids[i+1:]
                 if verbose:
-                    print(f"Checking {dockerfile}")
-                if dockerfile.is_file():
-                    dockerfiles.append(
-                        Dockerfile(dockerfile, Path(docker_search_dir),
-                                   ImageKey(layer_image_ids))
+                    print(
+                        f"Matched {dockerfile}, remaining image keys: "
+                        f"{'.'.join(image_ids)}"
                     )
-                    image_ids = image_ids[i+1:]
-                    if verbose:
-                        print(
-                            f"Matched {dockerfile}, remaining image keys: "
-                            f"{'.'.join(image_ids)}"
-                        )
-                    matched = True
-                    break
-            if matched:
                 break
         if unmatched_id_count == len(image_ids):
             if verbose:
@@ -532,10 +568,11 @@ def resolve_dockerfiles(
     return ImageBuildPlan(dockerfiles, image_key)
 
 
+@functools.lru_cache(maxsize=512)
 def check_docker_image_exists(image):
     try:
         run_shell(
-            f'docker manifest inspect {image}',
+            ['docker', 'manifest', 'inspect', image],
             capture_output=True,
             check=True
         )
@@ -544,6 +581,55 @@ def check_docker_image_exists(image):
         return False
 
 
+def retag_image(source_image, target_image, push=False):
+    """Tag an image that already exists in a registry with a new name."""
+    if push:
+        # Copies the manifest registry-side without pulling the image
+        run_shell(
+            ['docker', 'buildx', 'imagetools', 'create', '--tag', target_image, source_image],
+            capture_output=False, verbose=True, check=True
+        )
+    else:
+        run_shell(['docker', 'pull', source_image], capture_output=False, verbose=True, check=True)
+        run_shell(['docker', 'tag', source_image, target_image], verbose=True, check=True)
+
+
+def ensure_buildx_builder(builder_name, remote_builder=None, env=None):
+    """
+    Create a buildx builder, reusing an existing one with the same name and driver.
+
+    Returns True if a new builder was created by this call.
+    """
+    driver = 'remote' if remote_builder else 'docker-container'
+    exists, output, _ = run_shell(
+        ['docker', 'buildx', 'inspect', builder_name], capture_output=True, env=env
+    )
+    if exists:
+        drivers = [
+            value.strip()
+            for key, _, value in (line.partition(':') for line in output.splitlines())
+            if key.strip() == 'Driver'
+        ]
+        if driver in drivers and (not remote_builder or remote_builder in output):
+            print(f"Reusing buildx builder {builder_name}")
+            return False
+        remove_buildx_builder(builder_name, env=env)
+
+    if remote_builder:
+        create_cmd = [
+            'docker', 'buildx', 'create', '--driver', 'remote', '--name', builder_name,
+            remote_builder
+        ]
+    else:
+        create_cmd = ['docker', 'buildx', 'create', '--name', builder_name]
+    run_shell(create_cmd, verbose=True, env=env)
+    return True
+
+
+def remove_buildx_builder(builder_name, env=None):
+    run_shell(['docker', 'buildx', 'rm', builder_name], verbose=True, env=env)
+
+
 def countdown_warning(message, seconds=5):
     """Display a countdown warning message with the option to cancel."""
     print(f"\n{message}")
@@ -558,7 +644,57 @@ def countdown_warning(message, seconds=5):
         sys.exit(1)
 
 
-def get_image_name(cache_from_registry_name, env_list, file_arch, include_hash=False):
+@functools.lru_cache(maxsize=None)
+def get_default_config(platform_):
+    """Get the shared Config for a platform, loaded from the shell common config."""
+    config = Config(platform_=platform_)
+    config.load_shell_common_config()
+    return config
+
+
+@functools.lru_cache(maxsize=None)
+def get_build_plan_hash(image_key_str, docker_search_dirs):
+    """Get the md5hash of the resolved build plan, or None if it can't be resolved.
+
+    Hashes are also persisted in CACHE_DIR. An entry is reused only while the
+    search dirs (whose mtime changes when Dockerfiles are added or removed)
+    and the resolved Dockerfiles are unchanged on disk.
+    """
+    search_dirs = [os.path.abspath(d) for d in docker_search_dirs]
+    key = hashlib.sha1(repr(('build_plan_hash', image_key_str, search_dirs)).encode()).hexdigest()
+    cache_filepath = os.path.join(CACHE_DIR, f'{key}.plan.pkl')
+    cached = read_cache_file(cache_filepath)
+    if isinstance(cached, tuple) and len(cached) == 3:
+        dockerfile_paths, stamps, md5hash = cached
+        if _stat_stamps(search_dirs + dockerfile_paths) == stamps:
+            return md5hash
+
+    build_plan = resolve_dockerfiles(ImageKey.from_string(image_key_str), search_dirs)
+    if not build_plan:
+        return None
+    md5hash = build_plan.md5hash()
+    dockerfile_paths = [str(d.dockerfile_path_) for d in build_plan.dockerfiles_]
+    write_cache_file(
+        cache_filepath, (dockerfile_paths, _stat_stamps(search_dirs + dockerfile_paths), md5hash)
+    )
+    return md5hash
+
+
+def _stat_stamps(paths):
+    """(mtime_ns, size) for each path, or None for paths that don't exist."""
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            stamps.append(None)
+        else:
+            stamps.append((st.st_mtime_ns, st.st_size))
+    return stamps
+
+
+def get_image_name(cache_from_registry_name, env_list, file_arch, include_hash=False,
+                   config=None):
     """Get the full image name for a given environment list and architecture.
 
     Args:
@@ -566,6 +702,8 @@ def get_image_name(cache_from_registry_name, env_list, file_arch, include_hash=F
         env_list (List[str]): List of environment components
         file_arch (str): Architecture (e.g. 'amd64', 'sbsa', 'arm64')
         include_hash (bool): Whether to include the hash in the image name
+        config (Config): Already loaded config to resolve Dockerfiles with.
+            Defaults to the shell common config for file_arch's platform.
 
     Returns:
         str: Full image name including registry, environment components,
@@ -575,20 +713,21 @@ def get_image_name(cache_from_registry_name, env_list, file_arch, include_hash=F
     if os.getenv("CONFIG_CONTAINER_NAME_SUFFIX"):
         base_name += f"-{os.getenv('CONFIG_CONTAINER_NAME_SUFFIX')}"
 
-    # Use the same docker search dirs as main()
-    config = Config(
-        platform_="x86_64" if file_arch == "amd64"
-        else "aarch64" if file_arch == "arm64" or file_arch == "sbsa"
-        else platform.uname().machine
-    )
-    config.load_shell_common_config()
-    # Create ImageBuildPlan to get the hash
-    image_key = ImageKey.from_key_set(env_list, key_order=config.image_key_order_)
-    build_plan = resolve_dockerfiles(image_key, config.docker_search_dirs_)
-
     if include_hash:
-        if build_plan:
-            base_name += f"_{build_plan.md5hash()}"
+        # Use the same docker search dirs as main()
+        if config is None:
+            config = get_default_config(
+                "x86_64" if file_arch == "amd64"
+                else "aarch64" if file_arch == "arm64" or file_arch == "sbsa"
+                else platform.uname().machine
+            )
+        # Resolve the ImageBuildPlan to get the hash
+        image_key = ImageKey.from_key_set(env_list, key_order=config.image_key_order_)
+        build_plan_hash = get_build_plan_hash(
+            str(image_key), tuple(config.docker_search_dirs_)
+        )
+        if build_plan_hash:
+            base_name += f"_{build_plan_hash}"
         else:
             print("Error: Could not resolve all Dockerfiles.")
             print(f"Image key: {image_key}")
@@ -620,7 +759,8 @@ def main(image_key_set: List[str],
          nvcr_tag: bool = False,
          skip_registry_check: bool = False,
          build_local: bool = False,
-         push: bool = False):
+         push: bool = False,
+         clean: bool = False):
 
     platform_ = platform_ if platform_ else platform.uname().machine
 
@@ -674,88 +814,96 @@ def main(image_key_set: List[str],
         extra_build_args=config.build_args_,
         nvcr_tag=nvcr_tag
     )
-    docker_bake = ImageBuildPlan.as_hcl_str(docker_bake_dict)
-    print(docker_bake)
+    target_names = build_plan.target_names()
+    tags = [docker_bake_dict['targets'][target_name]['tags'][0] for target_name in target_names]
+    if skip_registry_check or no_cache or not tags:
+        tags_exist = [False] * len(tags)
+    else:
+        # Each check is a registry round-trip, so run them concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(tags))) as executor:
+            tags_exist = list(executor.map(check_docker_image_exists, tags))
 
     build_target_names = []
-    for target_name in build_plan.target_names():
-        target = docker_bake_dict['targets'][target_name]
-        tag = target['tags'][0]
-        if (not skip_registry_check) and (check_docker_image_exists(tag) and not no_cache):
+    for target_name, tag, tag_exists in zip(target_names, tags, tags_exist):
+        if tag_exists:
             print(f"Tag: {tag} exists, skipping")
             continue
         build_target_names.append(target_name)
 
+    env_dict = {'BUILDX_BAKE_ENTITLEMENTS_FS': '0'}
+    # The builder is kept between runs; it is only removed with --clean, or
+    # when a build fails on a builder this run created.
+    builder_name = f'isaaceks-{config.platform_}-persistent'
+
     # Exit early if all tags exist and there's nothing to build
     if not build_target_names and not config.target_image_name_:
         print("All target images already exist. Nothing to build.")
+        if clean:
+            remove_buildx_builder(builder_name, env=env_dict)
+        return
+
+    # Only final_target is left, which is a plain `FROM <last layer tag>`, so
+    # retag the existing image instead of going through buildx.
+    if not build_target_names:
+        print(f"All layers exist. Tagging image {config.target_image_name_}")
+        retag_image(tags[-1], config.target_image_name_, push=push)
+        if clean:
+            remove_buildx_builder(builder_name, env=env_dict)
         return
 
+    ImageBuildPlan.write_hcl(docker_bake_dict, sys.stdout)
+    print()
+
     with tempfile.TemporaryDirectory() as tempdir:
         bake_filepath = os.path.join(tempdir, 'docker-bake.hcl')
         with open(bake_filepath, mode='wt') as f:
-            f.write(docker_bake)
-        env_dict = {'BUILDX_BAKE_ENTITLEMENTS_FS': '0'}
-        builder_name = f'isaaceks-{config.platform_}'
-        no_cache_flag = '--no-cache' if no_cache else ''
-        debug_flag = '--debug' if verbose else ''
-
-        if not build_local and config.remote_builder_:
-            run_shell(
-                f'docker buildx create --driver remote --name {builder_name} '
-                f'{config.remote_builder_}',
-                verbose=True,
-                env=env_dict
+            ImageBuildPlan.write_hcl(docker_bake_dict, f)
+        no_cache_flag = ['--no-cache'] if no_cache else []
+        debug_flag = ['--debug'] if verbose else []
+
+        if not build_local and not config.remote_builder_:
+            countdown_warning(
+                "Remote build specification not found in config file.",
+                seconds=5
             )
-        else:
-            if not build_local and not config.remote_builder_:
-                countdown_warning(
-                    "Remote build specification not found in config file.",
-                    seconds=5
-                )
-            run_shell(
-                f'docker buildx create --name {builder_name}',
-                verbose=True,
+        # Without --push images are loaded through the default builder
+        created_builder = False
+        if push:
+            created_builder = ensure_buildx_builder(
+                builder_name,
+                remote_builder=None if build_local else config.remote_builder_,
                 env=env_dict
             )
 
-        progress_flag = "--progress=plain"
-
-        for target_name in build_target_names:
-            try:
-                print(f"Building image {target_name}")
-
-                build_cmd = (
-                    f'docker {debug_flag} buildx bake {target_name} '
-                    f'{no_cache_flag} {progress_flag} '
-                    f'--builder {builder_name if push else "default"} '
-                    f'--provenance=false '
-                    f'{"--push" if push else "--load"} '
-                    f'--file {bake_filepath}'
-                )
-                run_shell(build_cmd, capture_output=False, env=env_dict, check=True)
-            except subprocess.CalledProcessError as e:
-                run_shell(f'docker buildx rm {builder_name}', verbose=True, env=env_dict)
-                raise e
+        progress_flag = ["--progress=plain"]
 
+        # Each layer pulls its base by registry tag, so layers are baked one at a
+        # time in dependency order, followed by final_target.
+        bake_target_names = list(build_target_names)
         if config.target_image_name_:
+            bake_target_names.append('final_target')
+        for target_name in bake_target_names:
             try:
-                print(f"Building image {config.target_image_name_}")
-
-                final_cmd = (
-                    f'docker {debug_flag} buildx bake final_target '
-                    f'{no_cache_flag} {progress_flag} '
-                    f'--builder {builder_name if push else "default"} '
-                    f'--provenance=false '
-                    f'{"--push" if push else "--load"} '
-                    f'--file {bake_filepath}'
-                )
-                run_shell(final_cmd, capture_output=False, env=env_dict, check=True)
+                image_label = (config.target_image_name_
+                               if target_name == 'final_target' else target_name)
+                print(f"Building image {image_label}")
+
+                build_cmd = [
+                    'docker', *debug_flag, 'buildx', 'bake', target_name,
+                    *no_cache_flag, *progress_flag,
+                    '--builder', builder_name if push else 'default',
+                    '--provenance=false',
+                    '--push' if push else '--load',
+                    '--file', bake_filepath
+                ]
+                run_shell(build_cmd, capture_output=False, env=env_dict, check=True)
             except subprocess.CalledProcessError as e:
-                run_shell(f'docker buildx rm {builder_name}', verbose=True, env=env_dict)
+                if created_builder:
+                    remove_buildx_builder(builder_name, env=env_dict)
                 raise e
 
-        run_shell(f'docker buildx rm {builder_name}', verbose=True, env=env_dict)
+        if clean:
+            remove_buildx_builder(builder_name, env=env_dict)
 
 
 if __name__ == "__main__":
@@ -859,6 +1007,13 @@ if __name__ == "__main__":
         help="Push the image to the target registry when complete.",
         default=False
     )
+    parser.add_argument(
+        '--clean',
+        action="store_true",
+        dest="clean",
+        help="Remove the persistent buildx builder when complete.",
+        default=False
+    )
 
     args = parser.parse_args()
 
@@ -883,5 +1038,6 @@ if __name__ == "__main__":
         platform_=args.platform,
         nvcr_tag=args.nvcr,
         skip_registry_check=args.skip_registry_check,
-        build_local=args.build_local
+        build_local=args.build_local,
+        clean=args.clean
     )
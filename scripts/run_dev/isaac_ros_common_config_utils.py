@@ -6,8 +6,12 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-import yaml
+import functools
+import hashlib
 import os
+import pickle
+import stat
+import tempfile
 
 # Get the absolute path of this script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -22,15 +26,106 @@ COMMON_CONFIG_FILE_PATHS = [
 ]
 
 
+# Results of parsing config files, shared with build_image_layers.py
+CACHE_DIR = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'isaac-ros-cli'
+)
+
+# Values returned by load_cached in this process, by cache file path: (stamp, value)
+_LOADED = {}
+
+
+def read_cache_file(cache_filepath):
+    """Return the object pickled at cache_filepath, or None if it can't be read."""
+    try:
+        with open(cache_filepath, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache_file(cache_filepath, value):
+    """Atomically pickle value to cache_filepath, ignoring errors."""
+    tmp_filepath = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, delete=False) as f:
+            tmp_filepath = f.name
+            pickle.dump(value, f)
+        os.replace(tmp_filepath, cache_filepath)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # Caching is best-effort, but don't leave a partial temp file behind
+        if tmp_filepath is not None:
+            try:
+                os.unlink(tmp_filepath)
+            except OSError:
+                pass
+
+
+def load_cached(source_filepath, loader, cache_key_parts=(), persist=True):
+    """
+    Return loader(source_filepath), reusing the result of a previous call or run.
+
+    Each source path has a single cache entry. It is reused only while the
+    source's mtime and size and the extra cache_key_parts match the ones it was
+    stored with, and is overwritten otherwise. With persist=False the entry is
+    only kept for the current process. The returned value is shared between
+    callers and must not be modified.
+    """
+    st = os.stat(source_filepath)
+    stamp = (
+        st.st_mtime_ns,
+        st.st_size,
+        hashlib.sha1(repr(tuple(cache_key_parts)).encode()).hexdigest()
+    )
+    cache_filepath = os.path.join(
+        CACHE_DIR, hashlib.sha1(os.path.abspath(source_filepath).encode()).hexdigest() + '.pkl'
+    )
+    cached = _LOADED.get(cache_filepath)
+    if cached is None and persist:
+        cached = read_cache_file(cache_filepath)
+    if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == stamp:
+        _LOADED[cache_filepath] = cached
+        return cached[1]
+
+    value = loader(source_filepath)
+    if value is None:
+        return value
+    _LOADED[cache_filepath] = (stamp, value)
+    if persist:
+        write_cache_file(cache_filepath, (stamp, value))
+    return value
+
+
 def read_yaml(yaml_file):
-    with open(yaml_file, 'r') as f:
-        return yaml.safe_load(f)
+    return load_cached(yaml_file, _parse_yaml)
+
+
+def _parse_yaml(path):
+    # Imported here so that importing this module, or a read served from the
+    # cache, does not load PyYAML
+    import yaml
+
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def first_existing_file(paths):
+    """Return the first of paths that is a regular file, or None. Stops at the first hit."""
+    for path in paths:
+        try:
+            if stat.S_ISREG(os.stat(path).st_mode):
+                return path
+        except (OSError, ValueError):
+            continue
+    return None
 
 
+@functools.lru_cache(maxsize=None)
 def get_isaac_ros_common_config_path():
-    for path in COMMON_CONFIG_FILE_PATHS:
-        if os.path.exists(path):
-            return path
+    return first_existing_file(COMMON_CONFIG_FILE_PATHS)
 
 
 def get_isaac_ros_common_config_values(config_path):
@@ -38,11 +133,11 @@ def get_isaac_ros_common_config_values(config_path):
 
 
 def get_build_order(build_order, env):
-    env_ordered = []
-    for build_key in build_order:
-        if build_key in env:
-            env_ordered.append(build_key)
-    for build_key in env:
-        if build_key not in env_ordered:
-            env_ordered.append(build_key)
+    env_set = set(env)
+    env_ordered = [build_key for build_key in build_order if build_key in env_set]
+    ordered_set = set(env_ordered)
+    # dict.fromkeys de-duplicates while keeping the order of env
+    env_ordered.extend(
+        build_key for build_key in dict.fromkeys(env) if build_key not in ordered_set
+    )
     return env_ordered
@@ -8,10 +8,17 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+import concurrent.futures
+import functools
+import grp
+import io
 import os
+import pwd
+import re
 import sys
 import subprocess
 import shlex
+import threading
 from build_image_layers import (
     main as build_image_layers,
     check_docker_logins,
@@ -19,7 +26,25 @@ from build_image_layers import (
 from isaac_ros_common_config_utils import (
     get_isaac_ros_common_config_path,
     get_isaac_ros_common_config_values,
-    get_build_order)
+    get_build_order,
+    first_existing_file)
+
+# Host architecture (e.g. 'x86_64'); it cannot change during a run
+HOST_ARCH = os.uname().machine
+
+# $VAR or ${VAR} references in docker args files
+ENV_VAR_PATTERN = re.compile(r"\$(?:\{(\w+)\}|(\w+))")
+
+
+@functools.lru_cache(maxsize=None)
+def get_child_env():
+    """Environment for docker subprocesses, with color output forced on."""
+    return {
+        **os.environ,
+        "TERM": "xterm-256color",
+        "COLORTERM": "truecolor",
+        "FORCE_COLOR": "true"
+    }
 
 
 def validate_isaac_dir(isaac_dir):
@@ -28,11 +53,20 @@ def validate_isaac_dir(isaac_dir):
         sys.exit(1)
 
 
+def is_user_in_group(user, group):
+    try:
+        group_entry = grp.getgrnam(group)
+        return (user in group_entry.gr_mem
+                or pwd.getpwnam(user).pw_gid == group_entry.gr_gid)
+    except KeyError:
+        return False
+
+
 def check_user_in_docker_group():
-    output = subprocess.check_output(["groups", os.getenv("USER")], universal_newlines=True)
-    if "docker" not in output:
+    user = os.getenv("USER") or pwd.getpwuid(os.getuid()).pw_name
+    if not is_user_in_group(user, "docker"):
         print(
-            f"User {os.getenv('USER')} is not a member of the 'docker' group "
+            f"User {user} is not a member of the 'docker' group "
             "and cannot run docker commands without sudo."
         )
         print(
@@ -78,69 +112,147 @@ def check_git_lfs_installed():
         sys.exit(1)
 
 
+def has_git_lfs_dir(isaac_dir):
+    """
+    Returns whether git-lfs has stored anything for the checkout at isaac_dir.
+
+    Worktrees and submodules have a .git file pointing at their git dir; LFS
+    objects live in that git dir, or for worktrees in the shared common dir.
+    Returns True when the layout can't be read, so that callers still check.
+    """
+    git_dir = os.path.join(isaac_dir, ".git")
+    try:
+        if os.path.isfile(git_dir):
+            with open(git_dir, "r") as f:
+                content = f.read().strip()
+            if not content.startswith("gitdir:"):
+                return True
+            git_dir = os.path.join(isaac_dir, content[len("gitdir:"):].strip())
+            commondir_file = os.path.join(git_dir, "commondir")
+            if os.path.isfile(commondir_file):
+                with open(commondir_file, "r") as f:
+                    git_dir = os.path.join(git_dir, f.read().strip())
+    except OSError:
+        return True
+    return os.path.isdir(os.path.join(git_dir, "lfs"))
+
+
 def check_lfs_files(isaac_dir):
     print(isaac_dir)
+    # Nothing to check if git-lfs has never been used in this checkout
+    if not has_git_lfs_dir(isaac_dir):
+        return
     try:
         output = subprocess.check_output(
             ["git", "lfs", "ls-files"],
             cwd=isaac_dir,
             universal_newlines=True
         )
-        lfs_files = [line for line in output.splitlines()]
+        # "-" marks a file that is still an LFS pointer
+        pointer_files = [line.split()[2] for line in output.splitlines()
+                         if "-" in line.split()[1]]
+        if not pointer_files:
+            return
 
         output = subprocess.check_output(
             ["git", "lfs", "status"],
             cwd=isaac_dir,
             universal_newlines=True
         )
-        lfs_files_status = [line for line in output.splitlines()]
-
-        for line in lfs_files:
-            if "-" in line.split()[1]:
-                file = line.split()[2]
-                if not any(file in line for line in lfs_files_status):
-                    if not os.path.exists(os.path.join(isaac_dir, file)):
-                        print(f"LFS file {file} is missing. "
-                              "Please run `git lfs pull` after installing git-lfs.")
-                        sys.exit(1)
-            else:
-                pass
+        # Status entries look like "\t<path> (<from> -> <to>)"
+        status_files = {line.rsplit(" (", 1)[0].strip()
+                        for line in output.splitlines() if line.strip()}
+
+        for file in pointer_files:
+            if file not in status_files:
+                if not os.path.exists(os.path.join(isaac_dir, file)):
+                    print(f"LFS file {file} is missing. "
+                          "Please run `git lfs pull` after installing git-lfs.")
+                    sys.exit(1)
 
     except subprocess.CalledProcessError:
         pass
 
 
-def remove_exited_container(container_name):
+class ThreadOutput(threading.local):
+    """sys.stdout stand-in that sends each thread's writes to its own buffer, if set."""
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.buffer = None
+
+    def write(self, text):
+        return (self.buffer or self.stdout).write(text)
+
+    def flush(self):
+        (self.buffer or self.stdout).flush()
+
+
+def run_preflight_checks(checks):
+    """
+    Runs (check, *args) preflight checks concurrently, reporting them in order.
+
+    The checks print and exit on failure, so each one's output is buffered
+    and only the first failure in submission order is shown; checks that have
+    not started yet are cancelled.
+    """
+    stdout = sys.stdout
+    output = ThreadOutput(stdout)
+
+    def run_check(check, *args):
+        output.buffer = io.StringIO()
+        try:
+            check(*args)
+            code = None
+        except SystemExit as e:
+            code = e.code
+        text = output.buffer.getvalue()
+        output.buffer = None
+        return code, text
+
+    sys.stdout = output
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(run_check, *check) for check in checks]
+            for future in futures:
+                code, text = future.result()
+                stdout.write(text)
+                if code not in (None, 0):
+                    executor.shutdown(cancel_futures=True)
+                    sys.exit(code)
+    finally:
+        sys.stdout = stdout
+
+
+def get_container_state(container_name):
+    """Returns the state of the named container (e.g. 'running'), or None if it doesn't exist."""
     output = subprocess.check_output(
         [
             "docker",
             "ps",
             "-a",
-            "--quiet",
-            "--filter",
-            "status=exited",
             "--filter",
-            f"name={container_name}"
-        ]
+            f"name={container_name}",
+            "--format",
+            "{{.Names}}\t{{.State}}"
+        ],
+        universal_newlines=True
     )
-    if output:
+    # The name filter matches substrings, so look for the exact name
+    for line in output.splitlines():
+        name, _, state = line.partition("\t")
+        if name == container_name:
+            return state
+    return None
+
+
+def remove_exited_container(container_name, container_state):
+    if container_state == "exited":
         subprocess.run(["docker", "rm", container_name], stdout=subprocess.DEVNULL)
 
 
-def attach_to_running_container(container_name):
-    output = subprocess.check_output(
-        [
-            "docker",
-            "ps",
-            "-a",
-            "--quiet",
-            "--filter",
-            "status=running",
-            "--filter",
-            f"name={container_name}"
-        ]
-    )
-    if output:
+def attach_to_running_container(container_name, container_state):
+    if container_state == "running":
         print(f"Attaching to running container: {container_name}")
         isaac_ros_ws = subprocess.check_output(
             ["docker", "exec", container_name, "printenv", "ISAAC_ROS_WS"],
@@ -157,30 +269,33 @@ def attach_to_running_container(container_name):
                 "--workdir", isaac_ros_ws,
                 container_name, "/bin/bash"
             ],
-            env={
-                **os.environ,
-                "TERM": "xterm-256color",
-                "COLORTERM": "truecolor",
-                "FORCE_COLOR": "true"
-            }
+            env=get_child_env()
         )
         sys.exit(0)
 
 
-def make_docker_image_available(base_name, cached_image_name):
-    pull_result = subprocess.run(
-        [f"docker pull {base_name}"],
-        shell=True,
-        env={**os.environ, "TERM": "xterm-256color", "COLORTERM": "truecolor"}
-    )
+def make_docker_image_available(base_name, cached_image_name, refresh=False, offline=False):
+    """
+    Tag base_name as cached_image_name, pulling base_name first if needed.
 
-    local_image_result = subprocess.run(
-        ["docker", "image", "inspect", base_name],
-        capture_output=True,
-        env={**os.environ, "TERM": "xterm-256color", "COLORTERM": "truecolor"}
-    )
+    The local image is used as-is unless refresh is set; offline never pulls.
+    """
+    image_available = False
+    if not refresh:
+        image_available = subprocess.run(
+            ["docker", "image", "inspect", base_name],
+            capture_output=True,
+            env=get_child_env()
+        ).returncode == 0
+
+    if not image_available and not offline:
+        pull_result = subprocess.run(
+            ["docker", "pull", base_name],
+            env=get_child_env()
+        )
+        image_available = pull_result.returncode == 0
 
-    if pull_result.returncode == 0 or local_image_result.returncode == 0:
+    if image_available:
         # Remove any existing cached image
         subprocess.run(
             ["docker", "rmi", cached_image_name],
@@ -208,88 +323,92 @@ def get_existing_bash_configs():
 
 
 def get_docker_args(platform):
-    # Return arguments as complete flag-value pairs for shell=True usage
+    # Return arguments as argv tokens (no shell involved)
     home_path = os.path.expanduser('~')
     docker_args = [
-        "-v /tmp/.X11-unix:/tmp/.X11-unix",
-        f"-v {shlex.quote(home_path)}/.Xauthority:/home/admin/.Xauthority:rw",
+        "-v", "/tmp/.X11-unix:/tmp/.X11-unix",
+        "-v", f"{home_path}/.Xauthority:/home/admin/.Xauthority:rw",
     ]
     # Add existing bash config files
     for config in get_existing_bash_configs():
-        docker_args.append(
-            f"-v {shlex.quote(home_path)}/{config}:/home/admin/{config}:ro"
-        )
+        docker_args.extend([
+            "-v", f"{home_path}/{config}:/home/admin/{config}:ro"
+        ])
     docker_args.extend([
-        "-e DISPLAY",
-        "-e NVIDIA_VISIBLE_DEVICES=all",
-        "-e NVIDIA_DRIVER_CAPABILITIES=all",
-        "-e ROS_DOMAIN_ID",
-        "-e USER",
-        "-e ISAAC_ROS_WS=/workspaces/isaac_ros-dev",
-        f"-e HOST_USER_UID={os.getuid()}",
-        f"-e HOST_USER_GID={os.getgid()}",
+        "-e", "DISPLAY",
+        "-e", "NVIDIA_VISIBLE_DEVICES=all",
+        "-e", "NVIDIA_DRIVER_CAPABILITIES=all",
+        "-e", "ROS_DOMAIN_ID",
+        "-e", "USER",
+        "-e", "ISAAC_ROS_WS=/workspaces/isaac_ros-dev",
+        "-e", f"HOST_USER_UID={os.getuid()}",
+        "-e", f"HOST_USER_GID={os.getgid()}",
     ])
     if platform == "aarch64":
         if "SSH_AUTH_SOCK" in os.environ:
             ssh_auth_sock = os.environ['SSH_AUTH_SOCK']
             docker_args.extend([
-                f"-v {shlex.quote(ssh_auth_sock)}:/ssh-agent",
-                "-e SSH_AUTH_SOCK=/ssh-agent",
+                "-v", f"{ssh_auth_sock}:/ssh-agent",
+                "-e", "SSH_AUTH_SOCK=/ssh-agent",
             ])
         docker_args.extend([
-            "-v /usr/bin/tegrastats:/usr/bin/tegrastats",
-            "-v /sys/kernel/debug:/sys/kernel/debug:ro",  # Required for tegrastats
-            "-v /tmp/:/tmp/",
-            "-v /usr/lib/aarch64-linux-gnu/tegra:/usr/lib/aarch64-linux-gnu/tegra",
-            "-v /usr/src/jetson_multimedia_api:/usr/src/jetson_multimedia_api",
+            "-v", "/usr/bin/tegrastats:/usr/bin/tegrastats",
+            "-v", "/sys/kernel/debug:/sys/kernel/debug:ro",  # Required for tegrastats
+            "-v", "/tmp/:/tmp/",
+            "-v", "/usr/lib/aarch64-linux-gnu/tegra:/usr/lib/aarch64-linux-gnu/tegra",
+            "-v", "/usr/src/jetson_multimedia_api:/usr/src/jetson_multimedia_api",
             "--pid=host",
-            "-v /usr/share/vpi3:/usr/share/vpi3",
-            "-v /dev/input:/dev/input",
-            "-v /dev/bus/usb:/dev/bus/usb",
+            "-v", "/usr/share/vpi3:/usr/share/vpi3",
+            "-v", "/dev/input:/dev/input",
+            "-v", "/dev/bus/usb:/dev/bus/usb",
         ])
         try:
-            output = subprocess.check_output(
-                ["getent", "group", "jtop"], text=True
-            ).strip()
-            if output:
-                group_id = output.split(":")[2]
-                docker_args.extend([
-                    "-v /run/jtop.sock:/run/jtop.sock:ro",
-                    f"--group-add {group_id}",
-                ])
-        except subprocess.CalledProcessError:
+            group_id = grp.getgrnam("jtop").gr_gid
+            docker_args.extend([
+                "-v", "/run/jtop.sock:/run/jtop.sock:ro",
+                "--group-add", str(group_id),
+            ])
+        except KeyError:
             pass
 
     return docker_args
 
 
 def realpath(path):
-    return subprocess.check_output(['realpath', os.path.expanduser(path)]).decode().strip()
+    return os.path.realpath(os.path.expanduser(path))
+
+
+def expand_env_vars(text):
+    """Expand $VAR and ${VAR} like the shell does, so unset variables become empty."""
+    return ENV_VAR_PATTERN.sub(
+        lambda match: os.environ.get(match.group(1) or match.group(2), ""), text)
 
 
 def load_docker_args_from_file():
-    docker_args_files = [os.getenv("DOCKER_ARGS_FILE", "")]
-    docker_args_files.append("~/.isaac_ros_dev-dockerargs")
-
-    if os.path.isfile(os.path.join(os.path.dirname(__file__), ".isaac_ros_dev-dockerargs")):
-        docker_args_files.append(os.path.join(
-            os.path.dirname(__file__), ".isaac_ros_dev-dockerargs"))
-    elif "ISAAC_ROS_WS" in os.environ and os.path.isfile(
-        os.path.expandvars("$ISAAC_ROS_WS/../scripts/.isaac_ros_dev-dockerargs")
-    ):
-        docker_args_files.append(os.path.expandvars(
-            "$ISAAC_ROS_WS/../scripts/.isaac_ros_dev-dockerargs"))
-    else:
-        docker_args_files.append("/etc/isaac-ros-cli/.isaac_ros_dev-dockerargs")
+    script_dir = os.path.dirname(__file__)
+    default_docker_args_file = first_existing_file(
+        path for path in (
+            os.path.join(script_dir, ".isaac_ros_dev-dockerargs"),
+            "ISAAC_ROS_WS" in os.environ and os.path.expandvars(
+                "$ISAAC_ROS_WS/../scripts/.isaac_ros_dev-dockerargs")
+        ) if path
+    ) or "/etc/isaac-ros-cli/.isaac_ros_dev-dockerargs"
+    docker_args_files = [
+        os.getenv("DOCKER_ARGS_FILE", ""),
+        "~/.isaac_ros_dev-dockerargs",
+        default_docker_args_file
+    ]
+
+    def candidate_paths(docker_args_file):
+        yield docker_args_file
+        yield os.path.join(script_dir, docker_args_file)
+        yield os.path.expanduser(docker_args_file)
 
     docker_args_filepaths = []
     for docker_args_file in docker_args_files:
-        if os.path.isfile(docker_args_file):
-            docker_args_filepaths.append(docker_args_file)
-        elif os.path.isfile(os.path.join(os.path.dirname(__file__), docker_args_file)):
-            docker_args_filepaths.append(os.path.join(os.path.dirname(__file__), docker_args_file))
-        elif os.path.isfile(os.path.expanduser(docker_args_file)):
-            docker_args_filepaths.append(os.path.expanduser(docker_args_file))
+        docker_args_filepath = first_existing_file(candidate_paths(docker_args_file))
+        if docker_args_filepath:
+            docker_args_filepaths.append(docker_args_filepath)
 
     if docker_args_filepaths:
         docker_args = []
@@ -313,8 +432,12 @@ def load_docker_args_from_file():
                         # Quote the resolved path to handle spaces
                         quoted_path = shlex.quote(resolved_path)
                         line = line.replace(f"`realpath {path}`", quoted_path)
-                    # Make sure each line is a complete argument for shell=True
-                    docker_args.append(os.path.expandvars(line))
+                    # Tokenize each line the way the shell used to, including
+                    # expanding a leading ~ or ~user in each word
+                    docker_args.extend(
+                        os.path.expanduser(arg) if arg.startswith("~") else arg
+                        for arg in shlex.split(expand_env_vars(line))
+                    )
         print(docker_args)
         return docker_args
     return []
@@ -326,49 +449,38 @@ def run_docker_container(args, container_name, base_name, isaac_dir):
 
     docker_args.extend(file_args)
 
-    # Build the command as a single string for shell=True
-    # Use proper shell quoting for arguments that might contain spaces
-    docker_command_parts = [
-        "docker run -it --rm",
+    docker_command = [
+        "docker", "run", "-it", "--rm",
         "--privileged",
-        "--network host",
+        "--network", "host",
         "--ipc=host",
-        "-e TERM=xterm-256color",
-        "-e COLORTERM=truecolor",
-        "-e FORCE_COLOR=true",
-        "--workdir /workspaces/isaac_ros-dev",
+        "-e", "TERM=xterm-256color",
+        "-e", "COLORTERM=truecolor",
+        "-e", "FORCE_COLOR=true",
+        "--workdir", "/workspaces/isaac_ros-dev",
     ]
 
-    # Add Docker arguments as strings
-    docker_command_parts.extend(docker_args)
+    # Add Docker arguments
+    docker_command.extend(docker_args)
 
     # Add remaining arguments
-    docker_command_parts.extend([
-        f"-v {shlex.quote(isaac_dir)}:/workspaces/isaac_ros-dev",
-        "-v /etc/localtime:/etc/localtime:ro",
-        f"--name {shlex.quote(container_name)}",
-        "--runtime nvidia",
-        "--entrypoint /usr/local/bin/scripts/workspace-entrypoint.sh",
-        shlex.quote(base_name),
+    docker_command.extend([
+        "-v", f"{isaac_dir}:/workspaces/isaac_ros-dev",
+        "-v", "/etc/localtime:/etc/localtime:ro",
+        "--name", container_name,
+        "--runtime", "nvidia",
+        "--entrypoint", "/usr/local/bin/scripts/workspace-entrypoint.sh",
+        base_name,
         "/bin/bash"
     ])
 
-    # Join all command parts with spaces to create a single command string
-    docker_command_str = " ".join(docker_command_parts)
-
     print(f"Running {container_name}")
     if args.verbose:
-        print(docker_command_str)
+        print(shlex.join(docker_command))
 
     subprocess.run(
-        docker_command_str,
-        shell=True,
-        env={
-            **os.environ,
-            "TERM": "xterm-256color",
-            "COLORTERM": "truecolor",
-            "FORCE_COLOR": "true"
-        }
+        docker_command,
+        env=get_child_env()
     )
 
 
@@ -414,6 +526,20 @@ def parse_args():
         default=False,
         help="Push the image to the target registry when complete"
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        required=False,
+        default=False,
+        help="Pull the image even if it is available locally"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        required=False,
+        default=False,
+        help="Never pull the image; only use locally available images"
+    )
     parser.add_argument(
         "--container-name",
         default="isaac_ros_dev_container",
@@ -429,7 +555,7 @@ def parse_args():
     parser.add_argument(
         "--platform",
         choices=["x86_64", "aarch64"],
-        default=os.uname().machine,
+        default=HOST_ARCH,
         help="Override the platform architecture (default: auto-detected)"
     )
     parser.add_argument(
@@ -440,16 +566,16 @@ def parse_args():
 
     # Apply default env values only if nothing was provided
     if args.env is None:
-        args.env = DEFAULT_ENV_LIST.copy()
+        args.env = DEFAULT_ENV_LIST
 
-    # Append extra environments if provided
+    # Append extra environments if provided, keeping the first occurrence of each
     if args.extra_env:
-        args.env.extend([e for e in args.extra_env if e not in args.env])
+        args.env = list(dict.fromkeys([*args.env, *args.extra_env]))
 
     return args
 
 
-def get_isaac_dir():
+def get_isaac_dir(args):
     """
     Returns the absolute path of the ISAAC directory.
 
@@ -458,10 +584,12 @@ def get_isaac_dir():
     2. ISAAC_DIR environment variable if set
     3. Auto-detection by walking up from script location
 
+    Args:
+        args: Parsed command line arguments from parse_args().
+
     Returns:
         str: The absolute path of the ISAAC directory.
     """
-    args = parse_args()
     if args.isaac_dir:
         isaac_dir = args.isaac_dir
     elif "ISAAC_DIR" in os.environ:
@@ -502,17 +630,21 @@ def main():
         str(config['image_key_order'][0]).split('.'),
         args.env
     )
-    isaac_dir = get_isaac_dir()
+    isaac_dir = get_isaac_dir(args)
     container_name = args.container_name
 
     validate_isaac_dir(isaac_dir)
-    check_user_in_docker_group()
-    check_docker_running()
-    check_git_lfs_installed()
-    check_lfs_files(isaac_dir)
+    # The preflight checks are independent subprocess probes, so run them concurrently
+    run_preflight_checks([
+        (check_user_in_docker_group,),
+        (check_docker_running,),
+        (check_git_lfs_installed,),
+        (check_lfs_files, isaac_dir),
+    ])
 
-    remove_exited_container(container_name)
-    attach_to_running_container(container_name)
+    container_state = get_container_state(container_name)
+    remove_exited_container(container_name, container_state)
+    attach_to_running_container(container_name, container_state)
 
     if args.no_cache:
         cache_from_registry_name = "local"
@@ -558,7 +690,8 @@ def main():
             sys.exit(1)
         base_name = cached_image_name
 
-    elif not custom_image and not make_docker_image_available(base_name, cached_image_name):
+    elif not custom_image and not make_docker_image_available(
+            base_name, cached_image_name, refresh=args.refresh, offline=args.offline):
         if not (args.build or args.build_local):
             print(f"Error: Docker image {base_name} not found.")
             print("Use --build to build remotely or --build-local to build locally.")
@@ -7,25 +7,41 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+import importlib
+
 import click
 
-from isaac_ros_cli.commands.init import init
-from isaac_ros_cli.commands.activate import activate
-from isaac_ros_cli.commands.commit import commit
+# Subcommands by name, imported only when invoked (or listed by --help)
+LAZY_COMMANDS = {
+    'activate': 'isaac_ros_cli.commands.activate:activate',
+    'init': 'isaac_ros_cli.commands.init:init',
+    'commit': 'isaac_ros_cli.commands.commit:commit',
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules on first use."""
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
 
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
 
-@click.group()
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+        module_name, attr = self.lazy_commands[cmd_name].split(':')
+        return getattr(importlib.import_module(module_name), attr)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 def cli():
     """Isaac ROS CLI - Manage your Isaac ROS development environment."""
     pass
 
 
-# Register commands
-cli.add_command(activate)
-cli.add_command(init)
-cli.add_command(commit)
-
-
 def main():
     """Main entry point for console script."""
     cli()
@@ -9,9 +9,6 @@
 import click
 import sys
 
-# Import mode-specific implementations
-from .docker import activate_docker
-
 from isaac_ros_cli.config_loader import load_config
 
 
@@ -55,14 +52,16 @@ def activate(
             )
             sys.exit(1)
         case 'docker':
-            activate_docker(
+            # Mode-specific implementations are imported only when selected
+            from .docker import activate_docker
+            sys.exit(activate_docker(
                 build=build,
                 build_local=build_local,
                 push=push,
                 use_cached_build_image=use_cached_build_image,
                 no_cache=no_cache,
                 verbose=verbose
-            )
+            ))
         case _:
             click.echo(f"Error: Invalid environment configuration: {mode}", err=True)
             sys.exit(1)
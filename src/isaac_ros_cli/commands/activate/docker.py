@@ -6,12 +6,15 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-import subprocess
+import importlib.util
 import os
+import sys
+import traceback
 
 from isaac_ros_cli.config_loader import load_config
 
 RUN_DEV_SCRIPT = '/usr/lib/isaac-ros-cli/run_dev.py'
+HOST_ARCH = os.uname().machine
 
 
 def _build_run_dev_command(
@@ -38,7 +41,7 @@ def _build_run_dev_command(
 
     platform = cfg['docker']['run']['platform']
     if platform == 'auto':
-        platform = os.uname().machine
+        platform = HOST_ARCH
     cmd.extend(["--platform", platform])
 
     if "ISAAC_DIR" in os.environ:
@@ -78,5 +81,30 @@ def activate_docker(
     cmd = _build_run_dev_command(
         cfg, build, build_local, push, use_cached_build_image, no_cache, verbose)
 
-    # run run_dev.py
-    subprocess.run(cmd, check=False)
+    return _run_run_dev(cmd)
+
+
+def _run_run_dev(cmd):
+    """Run run_dev.py's main() in this interpreter and return its exit status."""
+    script_dir = os.path.dirname(RUN_DEV_SCRIPT)
+    saved_argv, saved_path = sys.argv, sys.path
+    # run_dev.py imports its sibling modules from the script directory
+    sys.path = [script_dir, *sys.path]
+    sys.argv = [RUN_DEV_SCRIPT, *cmd[1:]]
+    try:
+        spec = importlib.util.spec_from_file_location('run_dev', RUN_DEV_SCRIPT)
+        run_dev = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(run_dev)
+        run_dev.main()
+    except SystemExit as e:
+        # Map the exit status the way the interpreter would for a subprocess
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv, sys.path = saved_argv, saved_path
+    return 0
@@ -12,6 +12,10 @@ import sys
 
 from isaac_ros_cli.config_loader import load_config, update_config, ConfigScope
 
+# Static parts of the docker command lines; only names are appended per call
+_DOCKER_CONTAINER_INSPECT = ("docker", "container", "inspect", "--format", "{{.Name}}")
+_DOCKER_COMMIT = ("docker", "commit")
+
 
 @click.command()
 @click.argument('image_name', required=False)
@@ -28,14 +32,14 @@ def commit(image_name: str, set_default: bool):
     cfg = load_config()
     container_name = cfg['docker']['run']['container_name']
     
-    # Check if container exists
+    # Check if container exists; inspect looks up just this container
     result = subprocess.run(
-        ["docker", "ps", "-a", "--filter", f"name={container_name}", "--format", "{{.Names}}"],
-        capture_output=True,
-        text=True
+        (*_DOCKER_CONTAINER_INSPECT, container_name),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
     )
     
-    if not result.stdout.strip():
+    if result.returncode != 0:
         click.echo(f"Error: Container '{container_name}' not found.", err=True)
         click.echo("Please run 'isaac-ros activate' first to create a container.", err=True)
         sys.exit(1)
@@ -47,14 +51,16 @@ def commit(image_name: str, set_default: bool):
     
     # Commit the container
     click.echo(f"Committing container '{container_name}' to image '{image_name}'...")
+    # Only stderr is used, and only on failure, so it is kept as bytes until then
     commit_result = subprocess.run(
-        ["docker", "commit", container_name, image_name],
-        capture_output=True,
-        text=True
+        (*_DOCKER_COMMIT, container_name, image_name),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
     )
     
     if commit_result.returncode != 0:
-        click.echo(f"Error: Failed to commit container: {commit_result.stderr}", err=True)
+        stderr = commit_result.stderr.decode(errors="replace")
+        click.echo(f"Error: Failed to commit container: {stderr}", err=True)
         sys.exit(1)
     
     click.echo(f"✓ Successfully committed to image: {image_name}")
@@ -6,12 +6,19 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
+from collections import OrderedDict
+import copy
 from enum import Enum, auto
+import functools
 import os
+import stat
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Mapping
+from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
+# Parsed YAML files by path: (mtime_ns, size, parsed value)
+_YAML_CACHE: "OrderedDict[Path, tuple]" = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
 
 
 class ConfigScope(Enum):
@@ -22,7 +29,12 @@ class ConfigScope(Enum):
     WORKSPACE = auto()
 
 
-_CONFIG_SOURCE_CANDIDATES: Dict[ConfigScope, Path] = {
+_ISAAC_ROS_WS = os.getenv("ISAAC_ROS_WS")
+_WORKSPACE_CONFIG_PATH = (
+    Path(_ISAAC_ROS_WS) / ".isaac-ros-cli" / "config.yaml" if _ISAAC_ROS_WS else None
+)
+
+_CONFIG_SOURCE_CANDIDATES: Dict[ConfigScope, Optional[Path]] = {
     # Read-only default config, shipped with the package
     ConfigScope.READ_ONLY: Path("/usr/share/isaac-ros-cli/config.yaml"),
 
@@ -33,41 +45,48 @@ _CONFIG_SOURCE_CANDIDATES: Dict[ConfigScope, Path] = {
     ConfigScope.USER: Path.home() / ".config" / "isaac-ros-cli" / "config.yaml",
 
     # Workspace-level overrides, for power users
-    ConfigScope.WORKSPACE: (
-        Path(os.getenv("ISAAC_ROS_WS", "")) / ".isaac-ros-cli" / "config.yaml"
-    ) if os.getenv("ISAAC_ROS_WS") else None,
+    ConfigScope.WORKSPACE: _WORKSPACE_CONFIG_PATH,
 }
 
+# Available candidate paths, lowest precedence first
+_CONFIG_SOURCE_PATHS = tuple(
+    path for path in _CONFIG_SOURCE_CANDIDATES.values() if path is not None
+)
+
 
 def load_config() -> Dict[str, Any]:
     """Load the merged Isaac ROS CLI configuration."""
-    sources: List[Path] = []
-    for path in _CONFIG_SOURCE_CANDIDATES.values():
-        # Skip unavailable paths
-        if path is None:
+    # One stat per candidate, reused as the parse cache key
+    sources: List[Tuple[Path, os.stat_result]] = []
+    for path in _CONFIG_SOURCE_PATHS:
+        try:
+            sources.append((path, path.stat()))
+        except (FileNotFoundError, NotADirectoryError):
             continue
 
-        if path.exists():
-            sources.append(path)
-
     if not sources:
         raise FileNotFoundError(
             "No Isaac ROS CLI configuration files found. Tried: "
             + ", ".join(str(path) for path in _CONFIG_SOURCE_CANDIDATES.values())
         )
 
-    merged: Dict[str, Any] = {}
-    for path in sources:
+    merged: Optional[Dict[str, Any]] = None
+    for path, st in sources:
 
-        with path.open("r", encoding="utf-8") as f:
-            overlay = yaml.safe_load(f)
+        overlay = _load_yaml_file(path, st)
 
-        if not isinstance(overlay, Mapping):
+        # yaml.load only produces plain dicts for mappings
+        if type(overlay) is not dict:
             raise ValueError(
                 f"Configuration file {path} must contain a valid YAML mapping at the top level."
             )
 
-        merged = _deep_merge(merged, overlay)
+        # Overlays are fresh copies, so the first one becomes the result and
+        # later ones are merged into it without copying
+        if merged is None:
+            merged = overlay
+        elif overlay:
+            _deep_merge_into(merged, overlay)
 
     return merged
 
@@ -92,37 +111,124 @@ def update_config(overlay: Dict[str, Any], scope: ConfigScope) -> Path:
         raise ValueError("Cannot write to read-only config.")
 
     target = _CONFIG_SOURCE_CANDIDATES[scope]
-    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write through symlinks to the file they point at, like opening it would
+    real_target = Path(os.path.realpath(target))
 
-    # Load the existing configuration if it exists
+    # Load the existing configuration if it exists; only a new file may need
+    # its directory created
     config = {}
     original_permissions = None
-    if target.exists():
-        original_permissions = target.stat().st_mode
-        with target.open("r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+    try:
+        st = real_target.stat()
+    except FileNotFoundError:
+        real_target.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        original_permissions = stat.S_IMODE(st.st_mode)
+        # An empty file parses to None
+        config = _load_yaml_file(target, st) or {}
+
+    if original_permissions is None:
+        # mkstemp creates files as 0600; give new configs the usual umask-derived mode
+        umask = os.umask(0)
+        os.umask(umask)
+        original_permissions = 0o666 & ~umask
 
     # Merge the overlay with the existing configuration
-    config = _deep_merge(config, overlay)
+    _deep_merge_into(config, overlay)
+
+    # Configs are small, so emit the whole document first and write it in one call
+    config_str = _yaml_dump(config)
+
+    # Write the updated configuration to a uniquely named sibling file and swap it
+    # in atomically, so an interrupted or concurrent write never leaves a
+    # truncated config behind
+    fd, tmp_path = tempfile.mkstemp(
+        dir=real_target.parent, prefix=real_target.name + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            os.fchmod(f.fileno(), original_permissions)
+            f.write(config_str)
+        os.replace(tmp_path, real_target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Keep the parse cache hot for later reads in this process
+    _cache_yaml_file(target, target.stat(), copy.deepcopy(config))
 
-    # Write the updated configuration to the target
-    with target.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, sort_keys=False)
+    return target
 
-    if original_permissions is not None:
-        target.chmod(original_permissions)
 
-    return target
+def _load_yaml_file(path: Path, st: Optional[os.stat_result] = None) -> Any:
+    """Parse a YAML file, reusing the result while its mtime and size are unchanged.
+
+    Returns a deep copy so callers may modify the result freely. Pass st to
+    reuse a stat result the caller already has.
+    """
+    if st is None:
+        st = path.stat()
+    cached = _YAML_CACHE.get(path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        with path.open("r", encoding="utf-8") as f:
+            value = _yaml_load(f)
+        _cache_yaml_file(path, st, value)
+        return copy.deepcopy(value)
+    _YAML_CACHE.move_to_end(path)
+    return copy.deepcopy(cached[2])
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_functions():
+    """Import PyYAML on first use and bind its load and dump functions.
 
+    Prefers the libyaml-backed loader and dumper when PyYAML was built with them.
+    Config files keep their keys in insertion order when dumped.
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return (
+        functools.partial(yaml.load, Loader=loader),
+        functools.partial(yaml.dump, Dumper=dumper, sort_keys=False),
+    )
+
+
+def _yaml_load(stream) -> Any:
+    return _yaml_functions()[0](stream)
+
+
+def _yaml_dump(data: Any) -> str:
+    return _yaml_functions()[1](data)
 
-def _deep_merge(base: Dict[str, Any], overlay: Mapping[str, Any]) -> Dict[str, Any]:
-    """Deep merge two dictionaries."""
-    result: Dict[str, Any] = dict(base)
+
+def _cache_yaml_file(path: Path, st: os.stat_result, value: Any) -> None:
+    """Record value as the parsed contents of path as of st. The cache owns value."""
+    _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, value)
+    _YAML_CACHE.move_to_end(path)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+        _YAML_CACHE.popitem(last=False)
+
+
+def _deep_merge_into(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge overlay into base in place and return base.
+
+    Values from overlay, including whole sub-dicts missing from base, are stored
+    without copying: base takes ownership of them and later merges into base may
+    modify them. Pass an overlay the caller will not use again, or a copy.
+    """
+    if not overlay:
+        return base
 
     for key, value in overlay.items():
-        if isinstance(value, Mapping) and isinstance(result.get(key), Mapping):
-            result[key] = _deep_merge(result[key], value)
+        base_value = base.get(key)
+        if type(value) is dict and type(base_value) is dict:
+            _deep_merge_into(base_value, value)
         else:
-            result[key] = value
+            base[key] = value
 
-    return result
+    return base